@@ -3,15 +3,16 @@ LearnByShorts Authentication Lambda Function
 Professional serverless authentication with Google OAuth
 """
 
+import base64
+import hmac
 import json
 import boto3
-import uuid
+import secrets
 import time
 from datetime import datetime, timedelta
-from google.oauth2 import id_token
-from google.auth.transport import requests
-import jwt
 import os
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeSerializer
 from botocore.exceptions import ClientError
 
 # Configuration
@@ -23,6 +24,80 @@ TABLE_NAME = 'learnbyshorts-data'
 dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
 table = dynamodb.Table(TABLE_NAME)
 
+# Low-level client + serializer for transactional writes on the login path
+dynamodb_client = boto3.client('dynamodb', region_name='us-east-1')
+serializer = TypeSerializer()
+
+# HS256 signing material precomputed at cold start - the algorithm and
+# secret are fixed for the deployment, so no per-call key derivation
+JWT_SECRET_BYTES = JWT_SECRET.encode()
+JWT_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b'=')
+
+# In-container caches reused across warm invocations; entries expire after
+# CACHE_TTL_SECONDS so profile edits show up within a minute
+CACHE_TTL_SECONDS = 60
+_profile_cache = {}
+_google_id_cache = {}
+
+# The Google auth stack is only needed by /auth/google, so it's imported
+# lazily on the first login and cached; other endpoints never pay for it
+_google_id_token = None
+_google_request = None
+
+def get_google_verifier():
+    """Import Google auth on first use; reuse the session afterwards"""
+    global _google_id_token, _google_request
+    if _google_id_token is None:
+        from google.oauth2 import id_token
+        from google.auth.transport import requests as google_requests
+        import requests as http_requests
+        _google_id_token = id_token
+        # Shared HTTP session so warm invocations reuse the pooled TLS
+        # connection to Google
+        _google_request = google_requests.Request(session=http_requests.Session())
+    return _google_id_token, _google_request
+
+class InvalidTokenError(Exception):
+    """Token is malformed or its signature doesn't match"""
+
+class ExpiredSignatureError(InvalidTokenError):
+    """Token signature is valid but the token has expired"""
+
+def b64url_encode(data):
+    """Base64url-encode without padding (JWT style)"""
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+def b64url_decode(data):
+    """Decode unpadded base64url"""
+    return base64.urlsafe_b64decode(data + b'=' * (-len(data) % 4))
+
+def jwt_encode(payload):
+    """Sign a claims dict as an HS256 JWT"""
+    signing_input = JWT_HEADER_B64 + b'.' + b64url_encode(
+        json.dumps(payload, separators=(',', ':')).encode()
+    )
+    signature = hmac.new(JWT_SECRET_BYTES, signing_input, 'sha256').digest()
+    return (signing_input + b'.' + b64url_encode(signature)).decode()
+
+def jwt_decode(token):
+    """Verify an HS256 JWT and return its claims"""
+    try:
+        header_b64, payload_b64, signature_b64 = token.encode().split(b'.')
+        expected = hmac.new(JWT_SECRET_BYTES, header_b64 + b'.' + payload_b64, 'sha256').digest()
+        if not hmac.compare_digest(expected, b64url_decode(signature_b64)):
+            raise InvalidTokenError('Signature mismatch')
+        payload = json.loads(b64url_decode(payload_b64))
+    except InvalidTokenError:
+        raise
+    except Exception:
+        raise InvalidTokenError('Malformed token')
+
+    exp = payload.get('exp')
+    if exp is not None and exp < time.time():
+        raise ExpiredSignatureError('Token expired')
+
+    return payload
+
 def lambda_handler(event, context):
     """Main Lambda handler with CORS support"""
     
@@ -35,6 +110,15 @@ def lambda_handler(event, context):
     }
     
     try:
+        # Scheduled warmer ping (see lambda-warmer-rule.json) - return
+        # immediately, the point is just keeping this container alive
+        if event.get('warmer'):
+            return {
+                'statusCode': 200,
+                'headers': headers,
+                'body': json.dumps({'warmed': True})
+            }
+
         # Handle API Gateway v2 format
         method = event.get('httpMethod') or event.get('requestContext', {}).get('http', {}).get('method')
         path = event.get('path') or event.get('rawPath', '').replace('/prod', '')
@@ -90,9 +174,9 @@ def handle_google_login(event, headers):
         
         # Verify Google token
         try:
-            from google.auth.transport import requests as google_requests
+            id_token, google_request = get_google_verifier()
             idinfo = id_token.verify_oauth2_token(
-                google_token, google_requests.Request(), GOOGLE_CLIENT_ID
+                google_token, google_request, GOOGLE_CLIENT_ID
             )
             
             google_id = idinfo['sub']
@@ -105,20 +189,28 @@ def handle_google_login(event, headers):
         
         # Check if user exists
         user_id = get_user_by_google_id(google_id)
-        
+
+        transact_items = []
         if not user_id:
             # Create new user
-            user_id = str(uuid.uuid4())
-            create_user(user_id, google_id, email, name, avatar)
+            user_id = secrets.token_hex(16)
+            transact_items.extend(create_user_items(user_id, google_id, email, name, avatar))
         else:
             # Update last login
-            update_last_login(user_id)
-        
+            transact_items.append(update_last_login_item(user_id))
+
         # Generate JWT token
         jwt_token = generate_jwt_token(user_id, email)
-        
+
         # Create session
-        session_id = create_session(user_id, jwt_token)
+        session_id, session_item = create_session_item(user_id, jwt_token)
+        transact_items.append(session_item)
+
+        # One transactional write covers profile/last_login + session
+        dynamodb_client.transact_write_items(TransactItems=transact_items)
+
+        # Drop any stale cached profile now that it changed
+        _profile_cache.pop(user_id, None)
         
         return {
             'statusCode': 200,
@@ -150,35 +242,52 @@ def handle_verify_token(event, headers):
         
         token = auth_header.split(' ')[1]
         
-        # Verify JWT
+        # Verify JWT locally - a valid signature already proves the claims,
+        # so no DynamoDB read is needed on this hot path
         try:
-            payload = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-            user_id = payload['user_id']
-            
-            # Get user profile
-            user_profile = get_user_profile(user_id)
-            
-            if not user_profile:
-                return error_response(headers, 'User not found', 404)
-            
+            payload = jwt_decode(token)
+
             return {
                 'statusCode': 200,
                 'headers': headers,
                 'body': json.dumps({
                     'valid': True,
-                    'user': user_profile
+                    'user': {
+                        'id': payload['user_id'],
+                        'email': payload['email']
+                    }
                 })
             }
-            
-        except jwt.ExpiredSignatureError:
+
+        except ExpiredSignatureError:
             return error_response(headers, 'Token expired', 401)
-        except jwt.InvalidTokenError:
+        except InvalidTokenError:
             return error_response(headers, 'Invalid token', 401)
-            
+
     except Exception as e:
         print(f"Token verification error: {str(e)}")
         return error_response(headers, 'Verification failed', 500)
 
+def handle_get_profile(event, headers):
+    """Get full user profile (avatar, preferences) when the client needs it"""
+
+    user_id = get_user_from_token(event)
+    if not user_id:
+        return error_response(headers, 'Unauthorized', 401)
+
+    user_profile = get_user_profile(user_id)
+
+    if not user_profile:
+        return error_response(headers, 'User not found', 404)
+
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': json.dumps({
+            'user': user_profile
+        })
+    }
+
 def handle_get_progress(event, headers):
     """Get user progress"""
     
@@ -187,23 +296,30 @@ def handle_get_progress(event, headers):
         return error_response(headers, 'Unauthorized', 401)
     
     try:
-        # Get all progress records for user
-        response = table.query(
-            KeyConditionExpression='PK = :pk AND begins_with(SK, :sk)',
-            ExpressionAttributeValues={
-                ':pk': f'USER#{user_id}',
-                ':sk': 'PROGRESS#'
-            }
-        )
-        
+        # Get all progress records for user, following pagination so a
+        # user with many courses isn't silently truncated at 1 MB
+        query_kwargs = {
+            'KeyConditionExpression': (
+                Key('PK').eq(f'USER#{user_id}') & Key('SK').begins_with('PROGRESS#')
+            )
+        }
+        items = []
+        while True:
+            response = table.query(**query_kwargs)
+            items.extend(response['Items'])
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                break
+            query_kwargs['ExclusiveStartKey'] = last_key
+
         progress_data = {}
-        for item in response['Items']:
+        for item in items:
             course_id = item['SK'].replace('PROGRESS#', '')
             progress_data[course_id] = {
                 'topic_index': item.get('topic_index', 0),
                 'completed_topics': item.get('completed_topics', []),
                 'completion_percentage': item.get('completion_percentage', 0),
-                'last_accessed': item.get('last_accessed')
+                'last_accessed': isoformat_ts(item.get('last_accessed'))
             }
         
         return {
@@ -238,18 +354,25 @@ def handle_save_progress(event, headers):
         total_topics = body.get('total_topics', len(completed_topics))
         completion_percentage = (len(completed_topics) / total_topics * 100) if total_topics > 0 else 0
         
-        # Save progress
-        table.put_item(
-            Item={
+        # Save progress - a partial update only ships the fields that
+        # change (course_id lives in the key, and last_accessed already
+        # records the update time)
+        table.update_item(
+            Key={
                 'PK': f'USER#{user_id}',
-                'SK': f'PROGRESS#{course_id}',
-                'course_id': course_id,
-                'topic_index': topic_index,
-                'completed_topics': completed_topics,
-                'completion_percentage': completion_percentage,
-                'last_accessed': datetime.utcnow().isoformat(),
-                'updated_at': datetime.utcnow().isoformat()
-            }
+                'SK': f'PROGRESS#{course_id}'
+            },
+            UpdateExpression=(
+                'SET topic_index = :ti, completed_topics = :ct, '
+                'completion_percentage = :cp, last_accessed = :la'
+            ),
+            ExpressionAttributeValues={
+                ':ti': topic_index,
+                ':ct': completed_topics,
+                ':cp': completion_percentage,
+                ':la': int(time.time())
+            },
+            ReturnValues='NONE'
         )
         
         return {
@@ -266,64 +389,97 @@ def handle_save_progress(event, headers):
         return error_response(headers, 'Failed to save progress', 500)
 
 # Helper functions
+def cache_get(cache, key):
+    """Return a cached value if present and not expired"""
+    entry = cache.get(key)
+    if entry and entry[0] > time.time():
+        return entry[1]
+    return None
+
+def cache_put(cache, key, value):
+    """Store a value with the standard TTL"""
+    cache[key] = (time.time() + CACHE_TTL_SECONDS, value)
+
 def get_user_by_google_id(google_id):
     """Get user ID by Google ID"""
+    cached = cache_get(_google_id_cache, google_id)
+    if cached:
+        return cached
+
     try:
         response = table.query(
             IndexName='GSI1',
-            KeyConditionExpression='GSI1PK = :gsi1pk',
-            ExpressionAttributeValues={
-                ':gsi1pk': f'GOOGLE#{google_id}'
-            }
+            KeyConditionExpression=Key('GSI1PK').eq(f'GOOGLE#{google_id}'),
+            # Only the GSI1SK attribute is used (to extract the user id),
+            # and a google_id maps to exactly one user
+            ProjectionExpression='GSI1SK',
+            Limit=1
         )
         
         if response['Items']:
-            return response['Items'][0]['GSI1SK'].replace('USER#', '')
+            user_id = response['Items'][0]['GSI1SK'].replace('USER#', '')
+            cache_put(_google_id_cache, google_id, user_id)
+            return user_id
         return None
         
     except Exception as e:
         print(f"Error getting user by Google ID: {str(e)}")
         return None
 
-def create_user(user_id, google_id, email, name, avatar):
-    """Create new user"""
-    
-    timestamp = datetime.utcnow().isoformat()
-    
+def isoformat_ts(value):
+    """Render a stored timestamp as ISO 8601 (older rows already hold strings)"""
+    if value is None or isinstance(value, str):
+        return value
+    return datetime.utcfromtimestamp(int(value)).isoformat()
+
+def serialize_item(item):
+    """Marshal a plain dict into low-level DynamoDB attribute values"""
+    return {key: serializer.serialize(value) for key, value in item.items()}
+
+def create_user_items(user_id, google_id, email, name, avatar):
+    """Build the transaction entries for a new user's profile + email lookup rows"""
+
+    timestamp = int(time.time())
+
     # User profile
-    table.put_item(
-        Item={
-            'PK': f'USER#{user_id}',
-            'SK': 'PROFILE',
-            'GSI1PK': f'GOOGLE#{google_id}',
-            'GSI1SK': f'USER#{user_id}',
-            'google_id': google_id,
-            'email': email,
-            'name': name,
-            'avatar': avatar,
-            'created_at': timestamp,
-            'last_login': timestamp,
-            'preferences': {
-                'audio_enabled': True,
-                'theme': 'light',
-                'language': 'en'
-            }
+    profile_item = {
+        'PK': f'USER#{user_id}',
+        'SK': 'PROFILE',
+        'GSI1PK': f'GOOGLE#{google_id}',
+        'GSI1SK': f'USER#{user_id}',
+        'google_id': google_id,
+        'email': email,
+        'name': name,
+        'avatar': avatar,
+        'created_at': timestamp,
+        'last_login': timestamp,
+        'preferences': {
+            'audio_enabled': True,
+            'theme': 'light',
+            'language': 'en'
         }
-    )
-    
+    }
+
     # Email lookup
-    table.put_item(
-        Item={
-            'PK': f'EMAIL#{email}',
-            'SK': f'USER#{user_id}',
-            'GSI1PK': f'EMAIL#{email}',
-            'GSI1SK': f'USER#{user_id}',
-            'user_id': user_id
-        }
-    )
+    email_item = {
+        'PK': f'EMAIL#{email}',
+        'SK': f'USER#{user_id}',
+        'GSI1PK': f'EMAIL#{email}',
+        'GSI1SK': f'USER#{user_id}',
+        'user_id': user_id
+    }
+
+    return [
+        {'Put': {'TableName': TABLE_NAME, 'Item': serialize_item(profile_item)}},
+        {'Put': {'TableName': TABLE_NAME, 'Item': serialize_item(email_item)}}
+    ]
 
 def get_user_profile(user_id):
     """Get user profile"""
+    cached = cache_get(_profile_cache, user_id)
+    if cached:
+        return cached
+
     try:
         response = table.get_item(
             Key={
@@ -334,15 +490,17 @@ def get_user_profile(user_id):
         
         if 'Item' in response:
             item = response['Item']
-            return {
+            profile = {
                 'id': user_id,
                 'email': item['email'],
                 'name': item['name'],
                 'avatar': item['avatar'],
                 'preferences': item.get('preferences', {}),
-                'created_at': item['created_at'],
-                'last_login': item['last_login']
+                'created_at': isoformat_ts(item['created_at']),
+                'last_login': isoformat_ts(item['last_login'])
             }
+            cache_put(_profile_cache, user_id, profile)
+            return profile
         return None
         
     except Exception as e:
@@ -352,47 +510,50 @@ def get_user_profile(user_id):
 def generate_jwt_token(user_id, email):
     """Generate JWT token"""
     
+    now = int(time.time())
     payload = {
         'user_id': user_id,
         'email': email,
-        'exp': datetime.utcnow() + timedelta(days=7),
-        'iat': datetime.utcnow()
+        'exp': now + int(timedelta(days=7).total_seconds()),
+        'iat': now
     }
-    
-    return jwt.encode(payload, JWT_SECRET, algorithm='HS256')
 
-def create_session(user_id, token):
-    """Create user session"""
-    
-    session_id = str(uuid.uuid4())
-    expires_at = int((datetime.utcnow() + timedelta(days=7)).timestamp())
-    
-    table.put_item(
-        Item={
-            'PK': f'USER#{user_id}',
-            'SK': f'SESSION#{session_id}',
-            'session_token': token,
-            'expires_at': expires_at,
-            'created_at': datetime.utcnow().isoformat(),
-            'TTL': expires_at  # Auto-delete expired sessions
-        }
-    )
-    
-    return session_id
+    return jwt_encode(payload)
 
-def update_last_login(user_id):
-    """Update user's last login timestamp"""
-    
-    table.update_item(
-        Key={
-            'PK': f'USER#{user_id}',
-            'SK': 'PROFILE'
-        },
-        UpdateExpression='SET last_login = :timestamp',
-        ExpressionAttributeValues={
-            ':timestamp': datetime.utcnow().isoformat()
+def create_session_item(user_id, token):
+    """Build the transaction entry for a new session row"""
+
+    session_id = secrets.token_hex(16)
+    now = int(time.time())
+    expires_at = now + int(timedelta(days=7).total_seconds())
+
+    session_item = {
+        'PK': f'USER#{user_id}',
+        'SK': f'SESSION#{session_id}',
+        'session_token': token,
+        'expires_at': expires_at,
+        'created_at': now,
+        'TTL': expires_at  # Auto-delete expired sessions
+    }
+
+    return session_id, {'Put': {'TableName': TABLE_NAME, 'Item': serialize_item(session_item)}}
+
+def update_last_login_item(user_id):
+    """Build the transaction entry that bumps last_login on the profile row"""
+
+    return {
+        'Update': {
+            'TableName': TABLE_NAME,
+            'Key': serialize_item({
+                'PK': f'USER#{user_id}',
+                'SK': 'PROFILE'
+            }),
+            'UpdateExpression': 'SET last_login = :timestamp',
+            'ExpressionAttributeValues': {
+                ':timestamp': {'N': str(int(time.time()))}
+            }
         }
-    )
+    }
 
 def get_user_from_token(event):
     """Extract user ID from JWT token"""
@@ -404,8 +565,8 @@ def get_user_from_token(event):
             return None
         
         token = auth_header.split(' ')[1]
-        payload = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-        
+        payload = jwt_decode(token)
+
         return payload['user_id']
         
     except:
@@ -4,40 +4,125 @@ Tech News Crawler - Finds latest AI and tech articles
 """
 
 import json
+import orjson
 import requests
+import soupsieve
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import os
-import time
+import re
+import threading
 import hashlib
 from urllib.parse import urljoin, urlparse
 
 class TechNewsCrawler:
-    def __init__(self, sources_file='sources.json'):
+    def __init__(self, sources_file='sources.json', state_file='data/crawl_state.json'):
         with open(sources_file, 'r') as f:
             self.config = json.load(f)
+        # Per-source ETag/Last-Modified state so unchanged pages come back
+        # as cheap 304s instead of full downloads
+        self.state_file = state_file
+        self._crawl_state = self._load_crawl_state()
+        self._crawl_state_guard = threading.Lock()
         self.session = requests.Session()
+        # Larger connection pool + retries keep sockets warm across the
+        # thread pool instead of re-handshaking TLS per request
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.3,
+                              status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive'
         })
-        
+        # One lock per host so parallel crawls stay polite per-domain
+        self._host_locks = {}
+        self._host_locks_guard = threading.Lock()
+        # Compile each source's CSS selectors once instead of per element
+        self._compiled_selectors = {
+            source['name']: {
+                key: soupsieve.compile(value)
+                for key, value in source['selectors'].items()
+            }
+            for source in self.config['sources']
+        }
+        # One combined pattern scans an article once instead of looping
+        # over every keyword with a Python-level substring search
+        self._keyword_pattern = re.compile(
+            '|'.join(re.escape(keyword) for keyword in self.config['keywords']),
+            re.IGNORECASE
+        )
+
+    def _load_crawl_state(self):
+        """Load saved ETag/Last-Modified state from the previous crawl"""
+        try:
+            with open(self.state_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_crawl_state(self):
+        """Persist conditional-GET state for the next crawl"""
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            with open(self.state_file, 'w') as f:
+                json.dump(self._crawl_state, f)
+        except OSError as e:
+            print(f"⚠️ Could not save crawl state: {str(e)}")
+
+    def _host_lock(self, url):
+        """Get (or create) the politeness lock for a URL's host"""
+        host = urlparse(url).netloc
+        with self._host_locks_guard:
+            return self._host_locks.setdefault(host, threading.Lock())
+
     def crawl_source(self, source):
         """Crawl a single news source"""
         print(f"🔍 Crawling {source['name']}...")
         
         try:
-            response = self.session.get(source['url'], timeout=10)
+            url = source['url']
+            state = self._crawl_state.get(url, {})
+            conditional_headers = {}
+            if state.get('etag'):
+                conditional_headers['If-None-Match'] = state['etag']
+            if state.get('last_modified'):
+                conditional_headers['If-Modified-Since'] = state['last_modified']
+
+            with self._host_lock(url):
+                response = self.session.get(url, headers=conditional_headers, timeout=10)
+
+            if response.status_code == 304:
+                articles = state.get('articles', [])
+                print(f"✅ {source['name']} unchanged, reusing {len(articles)} cached articles")
+                return articles
+
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
+            soup = BeautifulSoup(response.content, 'lxml')
+
             articles = []
-            article_elements = soup.select(source['selectors']['articles'])
+            article_elements = self._compiled_selectors[source['name']]['articles'].select(soup)
             
             for element in article_elements[:5]:  # Limit to 5 articles per source
                 article = self.extract_article(element, source)
                 if article and self.is_relevant(article):
                     articles.append(article)
                     
+            with self._crawl_state_guard:
+                self._crawl_state[url] = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'articles': articles
+                }
+
             print(f"✅ Found {len(articles)} relevant articles from {source['name']}")
             return articles
             
@@ -48,10 +133,11 @@ class TechNewsCrawler:
     def extract_article(self, element, source):
         """Extract article data from HTML element"""
         try:
-            title_elem = element.select_one(source['selectors']['title'])
-            link_elem = element.select_one(source['selectors']['link'])
-            image_elem = element.select_one(source['selectors']['image'])
-            summary_elem = element.select_one(source['selectors']['summary'])
+            selectors = self._compiled_selectors[source['name']]
+            title_elem = selectors['title'].select_one(element)
+            link_elem = selectors['link'].select_one(element)
+            image_elem = selectors['image'].select_one(element)
+            summary_elem = selectors['summary'].select_one(element)
             
             if not title_elem or not link_elem:
                 return None
@@ -72,7 +158,7 @@ class TechNewsCrawler:
             summary = summary_elem.get_text(strip=True) if summary_elem else ""
             
             return {
-                'id': hashlib.md5(link.encode()).hexdigest()[:12],
+                'id': hashlib.blake2b(link.encode(), digest_size=6).hexdigest(),
                 'title': title,
                 'link': link,
                 'image_url': image_url,
@@ -88,31 +174,29 @@ class TechNewsCrawler:
     
     def is_relevant(self, article):
         """Check if article is relevant to AI/tech"""
-        text = f"{article['title']} {article['summary']}".lower()
-        
-        for keyword in self.config['keywords']:
-            if keyword.lower() in text:
-                return True
-        return False
+        text = f"{article['title']} {article['summary']}"
+        return self._keyword_pattern.search(text) is not None
     
     def crawl_all(self):
         """Crawl all configured sources"""
         print("🚀 Starting tech news crawl...")
         all_articles = []
-        
-        for source in self.config['sources']:
-            articles = self.crawl_source(source)
-            all_articles.extend(articles)
-            time.sleep(1)  # Be respectful to servers
-        
-        # Remove duplicates
-        seen_links = set()
-        unique_articles = []
-        for article in all_articles:
-            if article['link'] not in seen_links:
-                seen_links.add(article['link'])
-                unique_articles.append(article)
-        
+        sources = self.config['sources']
+
+        # Sources are independent, so fetch them concurrently; per-host
+        # locks keep requests to the same domain serialized
+        with ThreadPoolExecutor(max_workers=min(16, len(sources))) as executor:
+            futures = [executor.submit(self.crawl_source, source) for source in sources]
+            for future in as_completed(futures):
+                all_articles.extend(future.result())
+
+        self._save_crawl_state()
+
+        # Remove duplicates - dict keyed by link dedups in one C-level
+        # pass and keeps insertion order
+        unique_articles = list({article['link']: article for article in all_articles}.values())
+
+
         print(f"📊 Total unique articles found: {len(unique_articles)}")
         return unique_articles
     
@@ -124,13 +208,14 @@ class TechNewsCrawler:
         
         os.makedirs(os.path.dirname(filename), exist_ok=True)
         
-        with open(filename, 'w') as f:
-            json.dump({
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps({
                 'crawled_at': datetime.now().isoformat(),
                 'total_articles': len(articles),
                 'articles': articles
-            }, f, indent=2)
-        
+            }, option=orjson.OPT_INDENT_2))
+
+
         print(f"💾 Saved {len(articles)} articles to {filename}")
         return filename
 
@@ -6,15 +6,55 @@ Crawls latest tech jobs from multiple sources
 
 import requests
 from bs4 import BeautifulSoup
-import json
+import orjson
 from datetime import datetime, timedelta
 import hashlib
+import heapq
 import time
 import random
+from pathlib import Path
+
+# Sample-data pools, built once at import instead of reallocated on
+# every generate_sample_jobs call. US companies only.
+COMPANIES = (
+    {"name": "Google", "url": "https://www.linkedin.com/jobs/search/?keywords=google", "country": "USA"},
+    {"name": "Microsoft", "url": "https://www.linkedin.com/jobs/search/?keywords=microsoft", "country": "USA"},
+    {"name": "Apple", "url": "https://www.linkedin.com/jobs/search/?keywords=apple", "country": "USA"},
+    {"name": "Amazon", "url": "https://www.linkedin.com/jobs/search/?keywords=amazon", "country": "USA"},
+    {"name": "Meta", "url": "https://www.linkedin.com/jobs/search/?keywords=meta", "country": "USA"},
+    {"name": "Tesla", "url": "https://www.linkedin.com/jobs/search/?keywords=tesla", "country": "USA"},
+    {"name": "OpenAI", "url": "https://www.linkedin.com/jobs/search/?keywords=openai", "country": "USA"},
+    {"name": "Stripe", "url": "https://www.linkedin.com/jobs/search/?keywords=stripe", "country": "USA"},
+    {"name": "Airbnb", "url": "https://www.linkedin.com/jobs/search/?keywords=airbnb", "country": "USA"},
+    {"name": "Uber", "url": "https://www.linkedin.com/jobs/search/?keywords=uber", "country": "USA"},
+    {"name": "Netflix", "url": "https://www.linkedin.com/jobs/search/?keywords=netflix", "country": "USA"},
+    {"name": "Spotify", "url": "https://www.linkedin.com/jobs/search/?keywords=spotify", "country": "USA"},
+    {"name": "Slack", "url": "https://www.linkedin.com/jobs/search/?keywords=slack", "country": "USA"},
+    {"name": "Salesforce", "url": "https://www.linkedin.com/jobs/search/?keywords=salesforce", "country": "USA"},
+    {"name": "Oracle", "url": "https://www.linkedin.com/jobs/search/?keywords=oracle", "country": "USA"}
+)
+
+POSITIONS = (
+    "Senior Software Engineer", "Frontend Developer", "Backend Engineer",
+    "Full Stack Developer", "DevOps Engineer", "Data Scientist",
+    "Machine Learning Engineer", "Product Manager", "UI/UX Designer",
+    "Cloud Architect", "Security Engineer", "Mobile Developer"
+)
+
+US_LOCATIONS = (
+    "San Francisco, CA", "Seattle, WA", "New York, NY",
+    "Austin, TX", "Boston, MA", "Remote", "Los Angeles, CA",
+    "Chicago, IL", "Denver, CO", "Atlanta, GA"
+)
+
+JOB_TYPES = ("Full-time", "Contract", "Remote", "Hybrid")
 
 class TechJobsCrawler:
     def __init__(self):
         self.jobs = []
+        # Ensure the output directory once instead of per save
+        self.data_dir = Path("data")
+        self.data_dir.mkdir(exist_ok=True)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
@@ -38,61 +78,37 @@ class TechJobsCrawler:
     
     def generate_sample_jobs(self):
         """Generate sample tech jobs data"""
-        # US Companies Only
-        companies = [
-            {"name": "Google", "url": "https://www.linkedin.com/jobs/search/?keywords=google", "country": "USA"},
-            {"name": "Microsoft", "url": "https://www.linkedin.com/jobs/search/?keywords=microsoft", "country": "USA"},
-            {"name": "Apple", "url": "https://www.linkedin.com/jobs/search/?keywords=apple", "country": "USA"},
-            {"name": "Amazon", "url": "https://www.linkedin.com/jobs/search/?keywords=amazon", "country": "USA"},
-            {"name": "Meta", "url": "https://www.linkedin.com/jobs/search/?keywords=meta", "country": "USA"},
-            {"name": "Tesla", "url": "https://www.linkedin.com/jobs/search/?keywords=tesla", "country": "USA"},
-            {"name": "OpenAI", "url": "https://www.linkedin.com/jobs/search/?keywords=openai", "country": "USA"},
-            {"name": "Stripe", "url": "https://www.linkedin.com/jobs/search/?keywords=stripe", "country": "USA"},
-            {"name": "Airbnb", "url": "https://www.linkedin.com/jobs/search/?keywords=airbnb", "country": "USA"},
-            {"name": "Uber", "url": "https://www.linkedin.com/jobs/search/?keywords=uber", "country": "USA"},
-            {"name": "Netflix", "url": "https://www.linkedin.com/jobs/search/?keywords=netflix", "country": "USA"},
-            {"name": "Spotify", "url": "https://www.linkedin.com/jobs/search/?keywords=spotify", "country": "USA"},
-            {"name": "Slack", "url": "https://www.linkedin.com/jobs/search/?keywords=slack", "country": "USA"},
-            {"name": "Salesforce", "url": "https://www.linkedin.com/jobs/search/?keywords=salesforce", "country": "USA"},
-            {"name": "Oracle", "url": "https://www.linkedin.com/jobs/search/?keywords=oracle", "country": "USA"}
-        ]
-        
-        positions = [
-            "Senior Software Engineer", "Frontend Developer", "Backend Engineer",
-            "Full Stack Developer", "DevOps Engineer", "Data Scientist",
-            "Machine Learning Engineer", "Product Manager", "UI/UX Designer",
-            "Cloud Architect", "Security Engineer", "Mobile Developer"
-        ]
-        
-        us_locations = [
-            "San Francisco, CA", "Seattle, WA", "New York, NY", 
-            "Austin, TX", "Boston, MA", "Remote", "Los Angeles, CA",
-            "Chicago, IL", "Denver, CO", "Atlanta, GA"
-        ]
-        
-        job_types = ["Full-time", "Contract", "Remote", "Hybrid"]
-        
         # Generate jobs for last 3-4 days
         jobs = []
         base_date = datetime.now()
-        
-        for i in range(12):  # Generate 12 jobs
-            days_ago = random.randint(0, 4)
-            job_date = base_date - timedelta(days=days_ago)
-            
-            company = random.choice(companies)
+        base_iso = base_date.isoformat()
+        num_jobs = 12
+
+        # Draw each random column in one batched call instead of four
+        # random.choice calls per iteration
+        picked_companies = random.choices(COMPANIES, k=num_jobs)
+        picked_positions = random.choices(POSITIONS, k=num_jobs)
+        picked_job_types = random.choices(JOB_TYPES, k=num_jobs)
+        picked_locations = random.choices(US_LOCATIONS, k=num_jobs)
+        picked_days_ago = random.choices(range(5), k=num_jobs)
+        picked_salaries = random.choices(range(120, 301), k=num_jobs)
+
+        for i in range(num_jobs):
+            job_date = base_date - timedelta(days=picked_days_ago[i])
+
+            company = picked_companies[i]
             company_name = company["name"]
             company_url = company["url"]
-            position = random.choice(positions)
-            job_type = random.choice(job_types)
-            location = random.choice(us_locations)
-            
+            position = picked_positions[i]
+            job_type = picked_job_types[i]
+            location = picked_locations[i]
+
             # US salary ranges only (in thousands)
-            base_salary = random.randint(120, 300)
+            base_salary = picked_salaries[i]
             salary_range = f"${base_salary}K - ${base_salary + 50}K"
             
             job = {
-                "id": hashlib.md5(f"{company_name}_{position}_{i}".encode()).hexdigest()[:12],
+                "id": hashlib.blake2b(f"{company_name}_{position}_{i}".encode(), digest_size=6).hexdigest(),
                 "title": position,
                 "company": company_name,
                 "location": location,
@@ -106,7 +122,7 @@ class TechJobsCrawler:
                     "Experience with modern technology stack"
                 ],
                 "apply_url": company_url,
-                "crawled_at": datetime.now().isoformat()
+                "crawled_at": base_iso
             }
             
             jobs.append(job)
@@ -117,27 +133,30 @@ class TechJobsCrawler:
     
     def save_jobs(self, filename=None):
         """Save jobs to JSON file"""
+        now = datetime.now()
+        now_iso = now.isoformat()
+
         if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"data/tech_jobs_{timestamp}.json"
-        
+            filename = self.data_dir / f"tech_jobs_{now.strftime('%Y%m%d_%H%M%S')}.json"
+
         jobs_data = {
-            "last_updated": datetime.now().isoformat(),
+            "last_updated": now_iso,
             "total_jobs": len(self.jobs),
             "jobs": self.jobs
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(jobs_data, f, indent=2, ensure_ascii=False)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(jobs_data, option=orjson.OPT_INDENT_2))
         
-        # Also save to homepage data
+        # Also save to homepage data - top 6 newest jobs; nlargest stays
+        # O(N log 6) even if a real job API feeds thousands of jobs in
         homepage_jobs = {
-            "featuredJobs": self.jobs[:6],  # Top 6 jobs for homepage
-            "lastUpdated": datetime.now().isoformat()
+            "featuredJobs": heapq.nlargest(6, self.jobs, key=lambda job: job['posted_date']),
+            "lastUpdated": now_iso
         }
         
-        with open("../frontend/data/tech-jobs.json", 'w', encoding='utf-8') as f:
-            json.dump(homepage_jobs, f, indent=2, ensure_ascii=False)
+        with open("../frontend/data/tech-jobs.json", 'wb') as f:
+            f.write(orjson.dumps(homepage_jobs, option=orjson.OPT_INDENT_2))
         
         print(f"💾 Saved {len(self.jobs)} jobs to {filename}")
         print(f"🏠 Homepage jobs saved to ../frontend/data/tech-jobs.json")
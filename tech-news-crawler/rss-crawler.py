@@ -4,14 +4,54 @@ RSS-based Tech News Crawler - More reliable than HTML scraping
 """
 
 import feedparser
-import json
+import orjson
+import re
 import requests
+from lxml import etree
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import hashlib
-import os
+from pathlib import Path
+
+class BloomFilter:
+    """Compact Bloom filter for prescreening duplicate links.
+
+    Sized at 15 bits per expected item with 8 hash slices (~0.1% false
+    positives at capacity), it answers "definitely unseen" from a small
+    bitarray instead of keeping every URL string resident in a set.
+    """
+
+    def __init__(self, capacity=200_000):
+        self.num_bits = capacity * 15
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _indexes(self, item):
+        # One blake2b digest sliced into eight independent 64-bit hashes
+        digest = hashlib.blake2b(item.encode()).digest()
+        return [
+            int.from_bytes(digest[i:i + 8], 'little') % self.num_bits
+            for i in range(0, 64, 8)
+        ]
+
+    def add(self, item):
+        for index in self._indexes(item):
+            self.bits[index >> 3] |= 1 << (index & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(item))
 
 class RSSNewsCrawler:
-    def __init__(self):
+    def __init__(self, state_file='data/.feed_state.json'):
+        # Ensure the output directory once instead of per save
+        self.data_dir = Path("data")
+        self.data_dir.mkdir(exist_ok=True)
+
+        # Per-feed ETag/Last-Modified state lets unchanged feeds answer
+        # with a 304 instead of a full download + parse
+        self.state_file = Path(state_file)
+        self._feed_state = self._load_feed_state()
+        self.session = requests.Session()
+
         self.feeds = [
             {
                 "name": "TechCrunch AI",
@@ -45,91 +85,214 @@ class RSSNewsCrawler:
             "neural network", "deep learning", "GPT", "LLM", "ChatGPT",
             "generative AI", "computer vision", "NLP", "robotics"
         ]
-    
-    def crawl_feed(self, feed_info):
-        """Crawl a single RSS feed"""
-        print(f"🔍 Crawling {feed_info['name']}...")
-        
+
+        # One compiled pattern scans each article once instead of a
+        # Python-level substring check per keyword
+        self._ai_pattern = re.compile(
+            '|'.join(re.escape(keyword) for keyword in self.ai_keywords),
+            re.IGNORECASE
+        )
+
+    def _load_feed_state(self):
+        """Load saved ETag/Last-Modified state from the previous crawl"""
         try:
-            feed = feedparser.parse(feed_info['url'])
-            articles = []
-            
-            for entry in feed.entries[:10]:  # Limit to 10 per feed
-                article = {
-                    'id': hashlib.md5(entry.link.encode()).hexdigest()[:12],
+            with open(self.state_file, 'rb') as f:
+                return orjson.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_feed_state(self):
+        """Persist conditional-fetch state for the next crawl"""
+        try:
+            with open(self.state_file, 'wb') as f:
+                f.write(orjson.dumps(self._feed_state))
+        except OSError as e:
+            print(f"⚠️ Could not save feed state: {str(e)}")
+
+    def _parse_entries(self, content):
+        """Parse feed entries with lxml; fall back to feedparser for Atom/odd schemas"""
+        try:
+            root = etree.fromstring(content)
+            items = root.xpath('//item')
+            if not items:
+                raise ValueError('no RSS items')
+        except (etree.XMLSyntaxError, ValueError):
+            # feedparser tolerates Atom and malformed feeds that lxml's
+            # strict RSS path can't handle
+            feed = feedparser.parse(content)
+            entries = []
+            for entry in feed.entries:
+                if hasattr(entry, 'media_content'):
+                    image_url = entry.media_content[0]['url']
+                elif hasattr(entry, 'enclosures') and entry.enclosures:
+                    image_url = entry.enclosures[0].href
+                else:
+                    image_url = None
+                entries.append({
                     'title': entry.title,
                     'link': entry.link,
                     'summary': getattr(entry, 'summary', ''),
                     'published': getattr(entry, 'published', ''),
+                    'image_url': image_url
+                })
+            return entries
+
+        media_ns = '{http://search.yahoo.com/mrss/}'
+        entries = []
+        for item in items:
+            media = item.find(f'{media_ns}content')
+            enclosure = item.find('enclosure')
+            if media is not None and media.get('url'):
+                image_url = media.get('url')
+            elif enclosure is not None and enclosure.get('url'):
+                image_url = enclosure.get('url')
+            else:
+                image_url = None
+            entries.append({
+                'title': (item.findtext('title') or '').strip(),
+                'link': (item.findtext('link') or '').strip(),
+                'summary': (item.findtext('description') or '').strip(),
+                'published': (item.findtext('pubDate') or '').strip(),
+                'image_url': image_url
+            })
+        return entries
+
+    def _fetch_feed(self, feed_info):
+        """I/O stage: fetch a feed body, honoring conditional-GET state"""
+        print(f"🔍 Crawling {feed_info['name']}...")
+
+        url = feed_info['url']
+        state = self._feed_state.get(url, {})
+        conditional_headers = {}
+        if state.get('etag'):
+            conditional_headers['If-None-Match'] = state['etag']
+        if state.get('modified'):
+            conditional_headers['If-Modified-Since'] = state['modified']
+
+        try:
+            response = self.session.get(url, headers=conditional_headers, timeout=10)
+        except Exception as e:
+            print(f"❌ Error fetching {feed_info['name']}: {str(e)}")
+            return feed_info, None
+
+        return feed_info, response
+
+    def _extract_articles(self, feed_info, response):
+        """Parse stage: turn a fetched body into article dicts"""
+        if response is None:
+            return []
+
+        try:
+            url = feed_info['url']
+            state = self._feed_state.get(url, {})
+
+            if response.status_code == 304:
+                articles = state.get('articles', [])
+                print(f"✅ {feed_info['name']} unchanged, reusing {len(articles)} cached articles")
+                return articles
+
+            response.raise_for_status()
+            articles = []
+
+            # Every entry from this fetch is crawled at the same instant;
+            # format the timestamp once, not per entry
+            crawled_at = datetime.now().isoformat()
+
+            for entry in self._parse_entries(response.content)[:10]:  # Limit to 10 per feed
+                if not entry['link']:
+                    continue
+                article = {
+                    'id': hashlib.blake2b(entry['link'].encode(), digest_size=6).hexdigest(),
+                    'title': entry['title'],
+                    'link': entry['link'],
+                    'summary': entry['summary'],
+                    'published': entry['published'],
                     'source': feed_info['name'],
                     'category': feed_info['category'],
-                    'crawled_at': datetime.now().isoformat()
+                    'crawled_at': crawled_at,
+                    'image_url': entry['image_url']
                 }
-                
-                # Try to get image
-                if hasattr(entry, 'media_content'):
-                    article['image_url'] = entry.media_content[0]['url']
-                elif hasattr(entry, 'enclosures') and entry.enclosures:
-                    article['image_url'] = entry.enclosures[0].href
-                else:
-                    article['image_url'] = None
-                
+
                 # Check relevance for general tech feeds
                 if feed_info['category'] == 'Tech':
                     if self.is_ai_relevant(article):
                         articles.append(article)
                 else:
                     articles.append(article)
-            
+
+            self._feed_state[url] = {
+                'etag': response.headers.get('ETag'),
+                'modified': response.headers.get('Last-Modified'),
+                'articles': articles
+            }
+
             print(f"✅ Found {len(articles)} articles from {feed_info['name']}")
             return articles
-            
+
         except Exception as e:
             print(f"❌ Error crawling {feed_info['name']}: {str(e)}")
             return []
+
+    def crawl_feed(self, feed_info):
+        """Crawl a single RSS feed"""
+        return self._extract_articles(*self._fetch_feed(feed_info))
     
     def is_ai_relevant(self, article):
         """Check if article is AI/ML relevant"""
-        text = f"{article['title']} {article['summary']}".lower()
-        return any(keyword.lower() in text for keyword in self.ai_keywords)
+        text = f"{article['title']} {article['summary']}"
+        return self._ai_pattern.search(text) is not None
     
     def crawl_all(self):
         """Crawl all RSS feeds"""
         print("🚀 Starting RSS news crawl...")
         all_articles = []
-        
-        for feed_info in self.feeds:
-            articles = self.crawl_feed(feed_info)
-            all_articles.extend(articles)
-        
-        # Remove duplicates by link
+
+        # Two-stage pipeline: overlap all feed I/O in the thread pool,
+        # then run the (CPU-bound) parse stage outside the fetch threads
+        with ThreadPoolExecutor(max_workers=min(8, len(self.feeds))) as executor:
+            fetched = list(executor.map(self._fetch_feed, self.feeds))
+
+        for feed_info, response in fetched:
+            all_articles.extend(self._extract_articles(feed_info, response))
+
+        self._save_feed_state()
+
+        # Remove duplicates by link. The Bloom filter answers the common
+        # "definitely unseen" case from a few bits per link; only links it
+        # may have seen pay for the exact set check, which keeps memory
+        # bounded once feed unions grow past a handful of entries
+        bloom = BloomFilter()
         seen_links = set()
         unique_articles = []
         for article in all_articles:
-            if article['link'] not in seen_links:
-                seen_links.add(article['link'])
-                unique_articles.append(article)
-        
+            link = article['link']
+            if link in bloom and link in seen_links:
+                continue
+            bloom.add(link)
+            seen_links.add(link)
+            unique_articles.append(article)
+
+
         print(f"📊 Total unique articles found: {len(unique_articles)}")
         return unique_articles
     
     def save_articles(self, articles):
         """Save articles to JSON file"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"data/rss_tech_news_{timestamp}.json"
-        
-        os.makedirs("data", exist_ok=True)
-        
+        now = datetime.now()
+        filename = self.data_dir / f"rss_tech_news_{now.strftime('%Y%m%d_%H%M%S')}.json"
+
         data = {
-            'crawled_at': datetime.now().isoformat(),
+            'crawled_at': now.isoformat(),
             'total_articles': len(articles),
             'sources': list(set(article['source'] for article in articles)),
             'articles': articles
         }
         
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
-        
+        # 1 MiB write buffer keeps syscall count low as crawls grow
+        with open(filename, 'wb', buffering=1024 * 1024) as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+
         print(f"💾 Saved {len(articles)} articles to {filename}")
         return filename
 
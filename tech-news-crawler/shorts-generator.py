@@ -4,14 +4,53 @@ Tech News to Educational Shorts Generator
 Converts crawled articles into bite-sized educational content
 """
 
-import json
+import orjson
 import requests
+from dataclasses import dataclass
 from datetime import datetime
-import os
+import re
 import hashlib
+from pathlib import Path
+
+# Shared per-category templates, built once at import; every short in a
+# category references the same template object instead of a fresh copy
+IMAGE_TEMPLATES = {
+    "AI": (
+        {"type": "gradient", "colors": ["#667eea", "#764ba2"], "icon": "🤖"},
+        {"type": "gradient", "colors": ["#f093fb", "#f5576c"], "icon": "🧠"},
+        {"type": "gradient", "colors": ["#4facfe", "#00f2fe"], "icon": "⚡"},
+        {"type": "solid", "color": "#1a1a2e", "accent": "#16213e", "icon": "🚀"}
+    ),
+    "Tech": (
+        {"type": "gradient", "colors": ["#fa709a", "#fee140"], "icon": "💻"},
+        {"type": "gradient", "colors": ["#a8edea", "#fed6e3"], "icon": "📱"},
+        {"type": "gradient", "colors": ["#ff9a9e", "#fecfef"], "icon": "🔧"},
+        {"type": "solid", "color": "#2d3748", "accent": "#4a5568", "icon": "⚙️"}
+    )
+}
+
+@dataclass(slots=True)
+class Short:
+    """One educational short; slots keep the per-instance footprint small
+    and orjson serializes dataclasses natively"""
+    id: str
+    title: str
+    original_title: str
+    content: list
+    source_url: str
+    source_name: str
+    category: str
+    educational_prompt: str
+    image_template: dict
+    created_at: str
+    estimated_read_time: str
 
 class TechShortsGenerator:
     def __init__(self):
+        # Ensure the output directory once instead of probing per save
+        self.data_dir = Path("data")
+        self.data_dir.mkdir(exist_ok=True)
+
         self.educational_prompts = {
             "AI": [
                 "Explain this AI development in simple terms that a beginner could understand",
@@ -29,44 +68,39 @@ class TechShortsGenerator:
             ]
         }
         
-        self.image_templates = {
-            "AI": [
-                {"type": "gradient", "colors": ["#667eea", "#764ba2"], "icon": "🤖"},
-                {"type": "gradient", "colors": ["#f093fb", "#f5576c"], "icon": "🧠"},
-                {"type": "gradient", "colors": ["#4facfe", "#00f2fe"], "icon": "⚡"},
-                {"type": "solid", "color": "#1a1a2e", "accent": "#16213e", "icon": "🚀"}
-            ],
-            "Tech": [
-                {"type": "gradient", "colors": ["#fa709a", "#fee140"], "icon": "💻"},
-                {"type": "gradient", "colors": ["#a8edea", "#fed6e3"], "icon": "📱"},
-                {"type": "gradient", "colors": ["#ff9a9e", "#fecfef"], "icon": "🔧"},
-                {"type": "solid", "color": "#2d3748", "accent": "#4a5568", "icon": "⚙️"}
-            ]
-        }
-    
-    def generate_educational_content(self, article):
+        self.image_templates = IMAGE_TEMPLATES
+
+        # Compiled (pattern, prefix) dispatch checked in priority order -
+        # one case-insensitive scan each, no per-call .lower() copies
+        self._title_prefixes = [
+            (re.compile(r'AI', re.IGNORECASE), "🤖 AI Update: "),
+            (re.compile(r'startup|funding|investment', re.IGNORECASE), "💰 Startup News: "),
+            (re.compile(r'security|privacy|hack', re.IGNORECASE), "🔒 Security Alert: ")
+        ]
+
+    def generate_educational_content(self, article, created_at=None):
         """Generate educational short content from article"""
         category = article.get('category', 'Tech')
         prompt = self.educational_prompts[category][0]  # Use first prompt for now
+        if created_at is None:
+            created_at = datetime.now().isoformat()
         
         # Extract key points from article
         key_points = self.extract_key_points(article)
         
-        short = {
-            "id": f"short_{article['id']}",
-            "title": self.create_short_title(article['title']),
-            "original_title": article['title'],
-            "content": key_points,
-            "source_url": article['link'],
-            "source_name": article['source'],
-            "category": category,
-            "educational_prompt": prompt,
-            "image_template": self.select_image_template(category),
-            "created_at": datetime.now().isoformat(),
-            "estimated_read_time": "2-3 min"
-        }
-        
-        return short
+        return Short(
+            id=f"short_{article['id']}",
+            title=self.create_short_title(article['title']),
+            original_title=article['title'],
+            content=key_points,
+            source_url=article['link'],
+            source_name=article['source'],
+            category=category,
+            educational_prompt=prompt,
+            image_template=self.select_image_template(category),
+            created_at=created_at,
+            estimated_read_time="2-3 min"
+        )
     
     def extract_key_points(self, article):
         """Extract 3-5 key educational points from article"""
@@ -124,14 +158,10 @@ class TechShortsGenerator:
             short_title = original_title
             
         # Add engaging prefixes for different types
-        if "AI" in original_title.upper():
-            return f"🤖 AI Update: {short_title}"
-        elif any(word in original_title.lower() for word in ['startup', 'funding', 'investment']):
-            return f"💰 Startup News: {short_title}"
-        elif any(word in original_title.lower() for word in ['security', 'privacy', 'hack']):
-            return f"🔒 Security Alert: {short_title}"
-        else:
-            return f"📱 Tech News: {short_title}"
+        for pattern, prefix in self._title_prefixes:
+            if pattern.search(original_title):
+                return prefix + short_title
+        return f"📱 Tech News: {short_title}"
     
     def select_image_template(self, category):
         """Select appropriate image template"""
@@ -143,14 +173,19 @@ class TechShortsGenerator:
         """Process all articles into shorts"""
         print(f"📚 Processing articles into educational shorts...")
         
-        with open(articles_file, 'r') as f:
-            data = json.load(f)
+        # Binary read + orjson: the parser decodes UTF-8 itself, so this
+        # skips the Python-side text decode on large crawl files
+        with open(articles_file, 'rb') as f:
+            data = orjson.loads(f.read())
         
         articles = data['articles']
         shorts = []
-        
+
+        # One timestamp for the whole batch - every short in a run is
+        # created "now"
+        created_at = datetime.now().isoformat()
         for article in articles:
-            short = self.generate_educational_content(article)
+            short = self.generate_educational_content(article, created_at)
             shorts.append(short)
         
         print(f"✅ Generated {len(shorts)} educational shorts")
@@ -158,75 +193,110 @@ class TechShortsGenerator:
     
     def save_shorts(self, shorts):
         """Save shorts to JSON file"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"data/educational_shorts_{timestamp}.json"
-        
+        now = datetime.now()
+        filename = self.data_dir / f"educational_shorts_{now.strftime('%Y%m%d_%H%M%S')}.json"
+
         shorts_data = {
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": now.isoformat(),
             "total_shorts": len(shorts),
-            "categories": list(set(short['category'] for short in shorts)),
+            "categories": list(set(short.category for short in shorts)),
             "shorts": shorts
         }
         
-        with open(filename, 'w') as f:
-            json.dump(shorts_data, f, indent=2)
-        
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(shorts_data, option=orjson.OPT_INDENT_2))
+
+
         print(f"💾 Saved {len(shorts)} shorts to {filename}")
         return filename
     
+    def homepage_entry(self, short):
+        """Build the homepage representation of one short"""
+        return {
+            "id": short.id,
+            "title": short.title,
+            "category": short.category,
+            "readTime": short.estimated_read_time,
+            "imageTemplate": short.image_template,
+            "preview": short.content[0]['text'][:100] + "...",
+            "sourceUrl": short.source_url,
+            "sourceName": short.source_name
+        }
+
     def generate_homepage_data(self, shorts):
         """Generate data structure for homepage display"""
-        homepage_shorts = []
-        
-        for short in shorts[:10]:  # Limit to 10 for homepage
-            homepage_short = {
-                "id": short['id'],
-                "title": short['title'],
-                "category": short['category'],
-                "readTime": short['estimated_read_time'],
-                "imageTemplate": short['image_template'],
-                "preview": short['content'][0]['text'][:100] + "...",
-                "sourceUrl": short['source_url'],
-                "sourceName": short['source_name']
-            }
-            homepage_shorts.append(homepage_short)
-        
         return {
-            "featuredShorts": homepage_shorts,
+            "featuredShorts": [self.homepage_entry(short) for short in shorts[:10]],
             "lastUpdated": datetime.now().isoformat(),
             "totalShorts": len(shorts)
         }
 
+    def process_and_save(self, articles_file):
+        """Generate shorts, the shorts file and homepage data in one pass"""
+        print(f"📚 Processing articles into educational shorts...")
+
+        with open(articles_file, 'rb') as f:
+            data = orjson.loads(f.read())
+
+        now = datetime.now()
+        created_at = now.isoformat()
+
+        # Single pass: build the shorts list, the category set and the
+        # homepage slice together instead of re-walking the list per output
+        shorts = []
+        homepage_shorts = []
+        categories = set()
+        for article in data['articles']:
+            short = self.generate_educational_content(article, created_at)
+            shorts.append(short)
+            categories.add(short.category)
+            if len(homepage_shorts) < 10:
+                homepage_shorts.append(self.homepage_entry(short))
+
+        print(f"✅ Generated {len(shorts)} educational shorts")
+
+        shorts_file = self.data_dir / f"educational_shorts_{now.strftime('%Y%m%d_%H%M%S')}.json"
+        with open(shorts_file, 'wb') as f:
+            f.write(orjson.dumps({
+                "generated_at": created_at,
+                "total_shorts": len(shorts),
+                "categories": list(categories),
+                "shorts": shorts
+            }, option=orjson.OPT_INDENT_2))
+        print(f"💾 Saved {len(shorts)} shorts to {shorts_file}")
+
+        homepage_data = {
+            "featuredShorts": homepage_shorts,
+            "lastUpdated": created_at,
+            "totalShorts": len(shorts)
+        }
+        with open(self.data_dir / 'homepage_shorts.json', 'wb') as f:
+            f.write(orjson.dumps(homepage_data, option=orjson.OPT_INDENT_2))
+
+        return shorts, shorts_file, homepage_data
+
 if __name__ == "__main__":
     generator = TechShortsGenerator()
     
-    # Find latest articles file
-    data_files = [f for f in os.listdir('data') if f.startswith('rss_tech_news_')]
-    if not data_files:
+    # Find latest articles file - the filename embeds a sortable
+    # timestamp, so max() finds it without sorting the whole listing
+    latest_file = max(generator.data_dir.glob('rss_tech_news_*.json'), default=None)
+    if latest_file is None:
         print("❌ No articles found. Run rss-crawler.py first.")
         exit(1)
-    
-    latest_file = f"data/{sorted(data_files)[-1]}"
+
     print(f"📖 Processing: {latest_file}")
-    
-    # Generate shorts
-    shorts = generator.process_articles(latest_file)
-    shorts_file = generator.save_shorts(shorts)
-    
-    # Generate homepage data
-    homepage_data = generator.generate_homepage_data(shorts)
-    
-    # Save homepage data
-    with open('data/homepage_shorts.json', 'w') as f:
-        json.dump(homepage_data, f, indent=2)
-    
+
+    # Generate shorts + homepage data in one pass
+    shorts, shorts_file, homepage_data = generator.process_and_save(latest_file)
+
     print(f"🏠 Homepage data saved to data/homepage_shorts.json")
     
     # Show sample shorts
     print(f"\n📱 Sample Educational Shorts:")
     for i, short in enumerate(shorts[:3]):
-        print(f"\n{i+1}. {short['title']}")
-        print(f"   Category: {short['category']}")
-        print(f"   Template: {short['image_template']}")
-        print(f"   Points: {len(short['content'])} educational points")
-        print(f"   Source: {short['source_name']}")
+        print(f"\n{i+1}. {short.title}")
+        print(f"   Category: {short.category}")
+        print(f"   Template: {short.image_template}")
+        print(f"   Points: {len(short.content)} educational points")
+        print(f"   Source: {short.source_name}")